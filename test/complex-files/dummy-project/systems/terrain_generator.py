@@ -5,7 +5,7 @@ import json
 import sys
 from dataclasses import dataclass, asdict
 
-@dataclass
+@dataclass(slots=True)
 class TerrainResult:
     heightMap: list
     biomes: list
@@ -5,14 +5,24 @@ Generates visual representations of data for the multi-language demo
 """
 
 import json
+import math
 import sys
 import time
 import os
 import base64
 from typing import Dict, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from io import BytesIO
 
+import numpy as np
+
+
+def _mix2(x, y):
+    """Mix two integers (or uint32 arrays) into a pseudorandom 32-bit value"""
+    h = ((x * 0x9E3779B1) & 0xFFFFFFFF) ^ ((y * 0x85EBCA77) & 0xFFFFFFFF)
+    h ^= h >> 16
+    return (h * 0x7FEB352D) & 0xFFFFFFFF
+
 
 # Mock PIL for demonstration - in real implementation would use Pillow
 class MockImage:
@@ -22,13 +32,21 @@ class MockImage:
         self.mode = mode
         self.size = size
         self.color = color
+        self.pixels: Optional[np.ndarray] = None
+        self.rectangles: Optional[np.ndarray] = None
     
-    def save(self, fp: str, format: str = None):
+    def save(self, fp: str, format: str = None, generated_at: str = None):
         """Mock save method"""
         # Create a simple text file instead of actual image
-        with open(fp, 'w') as f:
-            f.write(f"Mock {format or 'PNG'} image: {self.size[0]}x{self.size[1]} {self.mode}\n")
-            f.write(f"Generated at: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        header = (
+            f"Mock {format or 'PNG'} image: {self.size[0]}x{self.size[1]} {self.mode}\n"
+            f"Generated at: {generated_at or time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+        )
+        if self.rectangles is not None:
+            header += f"Regions: {len(self.rectangles)}\n"
+        
+        with open(fp, 'wb') as f:
+            f.write(header.encode())
 
 
 class MockImageDraw:
@@ -41,12 +59,16 @@ class MockImageDraw:
         """Mock rectangle drawing"""
         pass
     
+    def line(self, xy: Tuple[int, int, int, int], fill: Any = None, width: int = 0):
+        """Mock line drawing"""
+        pass
+    
     def text(self, xy: Tuple[int, int], text: str, fill: Any = None):
         """Mock text drawing"""
         pass
 
 
-@dataclass
+@dataclass(slots=True)
 class VisualizationConfig:
     width: int = 512
     height: int = 512
@@ -55,7 +77,7 @@ class VisualizationConfig:
     background_color: str = '#ffffff'
 
 
-@dataclass
+@dataclass(slots=True)
 class VisualizationResult:
     imageUrl: str
     width: int
@@ -64,11 +86,30 @@ class VisualizationResult:
     processingTime: float
     dataPoints: int
     algorithm: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow field mapping for JSON output, without asdict's deep copy"""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
 
 
 class DataVisualizer:
     """Main visualization class for generating charts and images"""
     
+    # Height (0-255) to RGB lookup table: water, plains, hills, mountains in 64-wide bands
+    _HEIGHT_LUT = np.repeat(
+        np.array([(0, 0, 255), (0, 255, 0), (139, 69, 19), (255, 255, 255)], dtype=np.uint8),
+        64, axis=0
+    )
+    
+    # Dataset name keywords in priority order, mapped to visualization types
+    _TYPE_KEYWORDS = (
+        ('terrain', 'terrain'),
+        ('height', 'heightmap'),
+        ('biome', 'biome'),
+        ('chart', 'chart'),
+        ('graph', 'graph'),
+    )
+    
     def __init__(self):
         self.supported_formats = ['png', 'jpeg', 'svg', 'pdf']
         self.visualization_types = {
@@ -78,6 +119,7 @@ class DataVisualizer:
             'chart': self._visualize_chart,
             'graph': self._visualize_graph
         }
+        self._seq = 0
     
     def generate_visualization(self, data_set: str, output_dir: str = '/tmp/visualizations', 
                              config: VisualizationConfig = None) -> VisualizationResult:
@@ -96,8 +138,16 @@ class DataVisualizer:
         if viz_type not in self.visualization_types:
             raise ValueError(f"Unsupported visualization type: {viz_type}")
         
+        # Stamp every file saved during this call with the same time; the sequence
+        # number keeps files generated within the same second from overwriting each other
+        self._seq += 1
+        suffix = f'{int(start_time)}_{self._seq}'
+        generated_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time))
+        
         # Generate the visualization
-        image_path, data_points = self.visualization_types[viz_type](data_set, output_dir, config)
+        image_path, data_points = self.visualization_types[viz_type](
+            data_set, output_dir, config, suffix, generated_at
+        )
         
         processing_time = (time.time() - start_time) * 1000  # Convert to ms
         
@@ -115,73 +165,60 @@ class DataVisualizer:
         """Determine visualization type from dataset name"""
         data_set_lower = data_set.lower()
         
-        if 'terrain' in data_set_lower:
-            return 'terrain'
-        elif 'height' in data_set_lower:
-            return 'heightmap'
-        elif 'biome' in data_set_lower:
-            return 'biome'
-        elif 'chart' in data_set_lower:
-            return 'chart'
-        elif 'graph' in data_set_lower:
-            return 'graph'
-        else:
-            return 'chart'  # Default fallback
+        for keyword, viz_type in self._TYPE_KEYWORDS:
+            if keyword in data_set_lower:
+                return viz_type
+        
+        return 'chart'  # Default fallback
     
-    def _visualize_terrain(self, data_set: str, output_dir: str, config: VisualizationConfig) -> Tuple[str, int]:
+    def _visualize_terrain(self, data_set: str, output_dir: str, config: VisualizationConfig,
+                           suffix: str, generated_at: str) -> Tuple[str, int]:
         """Generate terrain visualization"""
-        image_path = os.path.join(output_dir, f'terrain_{int(time.time())}.{config.format}')
+        image_path = os.path.join(output_dir, f'terrain_{suffix}.{config.format}')
         
         # Create mock terrain visualization
         image = MockImage('RGB', (config.width, config.height), (100, 150, 100))
         
-        # Mock drawing terrain features
-        draw = MockImageDraw(image)
+        # Mock height-based coloring for every 20x20 tile in one vectorized pass
+        step = 20
+        xs = np.arange(0, config.width, step, dtype=np.uint32)
+        ys = np.arange(0, config.height, step, dtype=np.uint32)[:, None]
+        heights = (_mix2(xs, ys) & 0xFF).astype(np.uint8)
         
-        # Simulate drawing terrain elements
-        data_points = 0
-        for y in range(0, config.height, 20):
-            for x in range(0, config.width, 20):
-                # Mock height-based coloring
-                height = abs(hash(f"{x},{y}") % 256)
-                color = self._height_to_color(height)
-                draw.rectangle((x, y, x+20, y+20), fill=color)
-                data_points += 1
+        # One RGB color per tile, equivalent to drawing one rectangle per tile
+        image.pixels = self._HEIGHT_LUT[heights]
+        data_points = heights.size
         
-        image.save(image_path, config.format.upper())
+        image.save(image_path, config.format.upper(), generated_at)
         
         return image_path, data_points
     
-    def _visualize_heightmap(self, data_set: str, output_dir: str, config: VisualizationConfig) -> Tuple[str, int]:
+    def _visualize_heightmap(self, data_set: str, output_dir: str, config: VisualizationConfig,
+                             suffix: str, generated_at: str) -> Tuple[str, int]:
         """Generate heightmap visualization"""
-        image_path = os.path.join(output_dir, f'heightmap_{int(time.time())}.{config.format}')
+        image_path = os.path.join(output_dir, f'heightmap_{suffix}.{config.format}')
         
         # Create mock heightmap
         image = MockImage('L', (config.width, config.height), 128)  # Grayscale
         
-        # Mock drawing heightmap
-        draw = MockImageDraw(image)
-        
         data_points = config.width * config.height
         
-        # Simulate heightmap generation
-        for y in range(config.height):
-            for x in range(config.width):
-                # Generate mock height value
-                height = abs(hash(f"{x},{y}") % 256)
-                # In real implementation, would set pixel color based on height
+        # Generate mock height values for the whole grid in one vectorized pass
+        xs = np.arange(config.width, dtype=np.uint32)
+        ys = np.arange(config.height, dtype=np.uint32)[:, None]
+        image.pixels = (_mix2(xs, ys) & 0xFF).astype(np.uint8)
         
-        image.save(image_path, config.format.upper())
+        image.save(image_path, config.format.upper(), generated_at)
         
         return image_path, data_points
     
-    def _visualize_biomes(self, data_set: str, output_dir: str, config: VisualizationConfig) -> Tuple[str, int]:
+    def _visualize_biomes(self, data_set: str, output_dir: str, config: VisualizationConfig,
+                          suffix: str, generated_at: str) -> Tuple[str, int]:
         """Generate biome distribution visualization"""
-        image_path = os.path.join(output_dir, f'biomes_{int(time.time())}.{config.format}')
+        image_path = os.path.join(output_dir, f'biomes_{suffix}.{config.format}')
         
         # Create mock biome map
         image = MockImage('RGB', (config.width, config.height), (255, 255, 255))
-        draw = MockImageDraw(image)
         
         # Define biome colors
         biome_colors = {
@@ -192,27 +229,25 @@ class DataVisualizer:
             'grassland': (124, 252, 0)   # Lawn green
         }
         
-        data_points = 0
+        # Mock biome regions, 3 per biome, as columns x, y, w, h, r, g, b
+        # (positions are clamped to the origin on canvases of 100px or less)
+        colors = np.array(list(biome_colors.values()), dtype=np.uint32).repeat(3, axis=0)
+        k = np.arange(len(colors) * 4, dtype=np.uint32).reshape(len(colors), 4)
+        spans = np.array([max(1, config.width - 100), max(1, config.height - 100), 100, 100], dtype=np.uint32)
+        offsets = np.array([0, 0, 50, 50], dtype=np.uint32)
+        params = _mix2(k, 0) % spans + offsets
+        image.rectangles = np.column_stack((params, colors))
         
-        # Mock biome regions
-        for biome, color in biome_colors.items():
-            # Create random regions for each biome
-            for _ in range(3):  # 3 regions per biome
-                x = hash(f"{biome}_x") % (config.width - 100)
-                y = hash(f"{biome}_y") % (config.height - 100)
-                w = 50 + (hash(f"{biome}_w") % 100)
-                h = 50 + (hash(f"{biome}_h") % 100)
-                
-                draw.rectangle((x, y, x+w, y+h), fill=color)
-                data_points += 1
+        data_points = len(image.rectangles)
         
-        image.save(image_path, config.format.upper())
+        image.save(image_path, config.format.upper(), generated_at)
         
         return image_path, data_points
     
-    def _visualize_chart(self, data_set: str, output_dir: str, config: VisualizationConfig) -> Tuple[str, int]:
+    def _visualize_chart(self, data_set: str, output_dir: str, config: VisualizationConfig,
+                         suffix: str, generated_at: str) -> Tuple[str, int]:
         """Generate chart visualization"""
-        image_path = os.path.join(output_dir, f'chart_{int(time.time())}.{config.format}')
+        image_path = os.path.join(output_dir, f'chart_{suffix}.{config.format}')
         
         # Create mock chart
         image = MockImage('RGB', (config.width, config.height), (255, 255, 255))
@@ -228,16 +263,17 @@ class DataVisualizer:
         # Draw mock data points
         for i in range(data_points):
             x = 60 + i * (config.width - 120) // data_points
-            y = 60 + (hash(f"data_{i}") % (config.height - 120))
+            y = 60 + (_mix2(i, 0) % (config.height - 120))
             draw.rectangle((x-2, y-2, x+2, y+2), fill=(255, 0, 0))
         
-        image.save(image_path, config.format.upper())
+        image.save(image_path, config.format.upper(), generated_at)
         
         return image_path, data_points
     
-    def _visualize_graph(self, data_set: str, output_dir: str, config: VisualizationConfig) -> Tuple[str, int]:
+    def _visualize_graph(self, data_set: str, output_dir: str, config: VisualizationConfig,
+                         suffix: str, generated_at: str) -> Tuple[str, int]:
         """Generate graph visualization"""
-        image_path = os.path.join(output_dir, f'graph_{int(time.time())}.{config.format}')
+        image_path = os.path.join(output_dir, f'graph_{suffix}.{config.format}')
         
         # Create mock graph
         image = MockImage('RGB', (config.width, config.height), (255, 255, 255))
@@ -247,38 +283,23 @@ class DataVisualizer:
         nodes = 8
         data_points = nodes
         
+        # Lay out all nodes on a ring at once; each node connects to the next one
+        angles = np.arange(nodes) * (math.tau / nodes)
+        xs = (config.width // 2 + 150 * np.cos(angles)).astype(np.int32)
+        ys = (config.height // 2 + 150 * np.sin(angles)).astype(np.int32)
+        next_xs, next_ys = np.roll(xs, -1), np.roll(ys, -1)
+        
         # Draw mock nodes
-        for i in range(nodes):
-            angle = (2 * 3.14159 * i) / nodes
-            x = int(config.width // 2 + 150 * __import__('math').cos(angle))
-            y = int(config.height // 2 + 150 * __import__('math').sin(angle))
-            
+        for x, y, next_x, next_y in zip(xs.tolist(), ys.tolist(), next_xs.tolist(), next_ys.tolist()):
             # Draw node
             draw.rectangle((x-10, y-10, x+10, y+10), fill=(0, 100, 200))
             
-            # Draw connections to next node
-            next_i = (i + 1) % nodes
-            next_angle = (2 * 3.14159 * next_i) / nodes
-            next_x = int(config.width // 2 + 150 * __import__('math').cos(next_angle))
-            next_y = int(config.height // 2 + 150 * __import__('math').sin(next_angle))
-            
-            # Mock line drawing
-            # In real implementation would draw actual lines
+            # Draw connection to next node
+            draw.line((x, y, next_x, next_y), fill=(0, 100, 200), width=2)
         
-        image.save(image_path, config.format.upper())
+        image.save(image_path, config.format.upper(), generated_at)
         
         return image_path, data_points
-    
-    def _height_to_color(self, height: int) -> Tuple[int, int, int]:
-        """Convert height value to RGB color"""
-        if height < 64:
-            return (0, 0, 255)      # Water - blue
-        elif height < 128:
-            return (0, 255, 0)      # Plains - green
-        elif height < 192:
-            return (139, 69, 19)    # Hills - brown
-        else:
-            return (255, 255, 255)  # Mountains - white
 
 
 def main():
@@ -311,7 +332,7 @@ def main():
         result = visualizer.generate_visualization(data_set, output_dir, config)
         
         # Output result as JSON
-        output = asdict(result)
+        output = result.to_dict()
         print(json.dumps(output, indent=2))
         
     except Exception as e: